@@ -0,0 +1,29 @@
+"""drop redundant indexes on primary key columns
+
+Revision ID: 4a9d2f7c1e60
+Revises: e81b4c06d5a3
+Create Date: 2026-10-15 12:20:05.910344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9d2f7c1e60'
+down_revision: Union[str, None] = 'e81b4c06d5a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Primary keys already carry a unique btree (transactions_pkey, users_pkey)
+    op.drop_index(op.f('ix_transactions_pk_id'), table_name='transactions', if_exists=True)
+    op.drop_index(op.f('ix_users_uuid5'), table_name='users', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_users_uuid5'), 'users', ['uuid5'], unique=False)
+    op.create_index(op.f('ix_transactions_pk_id'), 'transactions', ['pk_id'], unique=False)
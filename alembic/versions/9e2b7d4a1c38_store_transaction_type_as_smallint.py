@@ -0,0 +1,69 @@
+"""store transaction type as smallint
+
+Revision ID: 9e2b7d4a1c38
+Revises: 4a9d2f7c1e60
+Create Date: 2026-10-15 14:02:17.538120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2b7d4a1c38'
+down_revision: Union[str, None] = '4a9d2f7c1e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Codes must match TransactionTypeColumn.CODES
+    op.drop_index('ix_tx_origin_type_created', table_name='transactions', if_exists=True)
+    op.alter_column(
+        'transactions',
+        'transaction_type',
+        existing_type=sa.Enum('deposit', 'withdrawal', 'transfer', name='transactiontype'),
+        type_=sa.SmallInteger(),
+        existing_nullable=False,
+        comment='Type of transaction (0=deposit, 1=withdrawal, 2=transfer)',
+        postgresql_using=(
+            "CASE transaction_type::text "
+            "WHEN 'deposit' THEN 0 "
+            "WHEN 'withdrawal' THEN 1 "
+            "WHEN 'transfer' THEN 2 END"
+        )
+    )
+    op.execute("DROP TYPE IF EXISTS transactiontype")
+    op.create_index(
+        'ix_tx_origin_type_created',
+        'transactions',
+        ['origin_account_number', 'transaction_type', 'created_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tx_origin_type_created', table_name='transactions', if_exists=True)
+    op.execute("CREATE TYPE transactiontype AS ENUM ('deposit', 'withdrawal', 'transfer')")
+    op.alter_column(
+        'transactions',
+        'transaction_type',
+        existing_type=sa.SmallInteger(),
+        type_=sa.Enum('deposit', 'withdrawal', 'transfer', name='transactiontype'),
+        existing_nullable=False,
+        comment='Type of transaction (e.g., deposit, withdrawal)',
+        postgresql_using=(
+            "(CASE transaction_type "
+            "WHEN 0 THEN 'deposit' "
+            "WHEN 1 THEN 'withdrawal' "
+            "WHEN 2 THEN 'transfer' END)::transactiontype"
+        )
+    )
+    op.create_index(
+        'ix_tx_origin_type_created',
+        'transactions',
+        ['origin_account_number', 'transaction_type', 'created_at'],
+        unique=False
+    )
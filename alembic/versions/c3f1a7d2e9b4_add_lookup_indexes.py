@@ -0,0 +1,56 @@
+"""add lookup indexes for accounts owner and transactions origin
+
+Revision ID: c3f1a7d2e9b4
+Revises: 25a63da41fb7, add_transfer_enum
+Create Date: 2026-10-15 10:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a7d2e9b4'
+down_revision: Union[str, Sequence[str], None] = ('25a63da41fb7', 'add_transfer_enum')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    # users.user_number is already covered by its UNIQUE constraint index
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_accounts_owner'),
+            'accounts',
+            ['owner'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_tx_origin_type_created',
+            'transactions',
+            ['origin_account_number', 'transaction_type', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tx_origin_type_created',
+            table_name='transactions',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            op.f('ix_accounts_owner'),
+            table_name='accounts',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
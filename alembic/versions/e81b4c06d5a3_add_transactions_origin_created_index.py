@@ -0,0 +1,41 @@
+"""add transactions origin and created_at index for paginated listing
+
+Revision ID: e81b4c06d5a3
+Revises: c3f1a7d2e9b4
+Create Date: 2026-10-15 11:02:17.583190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81b4c06d5a3'
+down_revision: Union[str, None] = 'c3f1a7d2e9b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tx_origin_created',
+            'transactions',
+            ['origin_account_number', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tx_origin_created',
+            table_name='transactions',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
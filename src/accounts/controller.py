@@ -9,7 +9,7 @@ from uuid import uuid4, uuid5
 from typing import Optional
 
 from fastapi import APIRouter, Body, HTTPException, Query, status
-from pydantic import UUID4
+from pydantic import UUID4, TypeAdapter
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from fastapi_pagination import Page, paginate
@@ -28,6 +28,10 @@ from .models import AccountModel
 
 router = APIRouter()
 
+# Batch validators for list responses - one pydantic-core call per result set
+ACCOUNT_LIST_ADAPTER = TypeAdapter(list[AccountList])
+ACCOUNT_OUT_LIST_ADAPTER = TypeAdapter(list[AccountOut])
+
 
 @router.post(
     '/',
@@ -146,11 +150,8 @@ async def get_all_my_accounts(
     result = await db_session.execute(query)
     entities = result.scalars().all()
     
-    # Convert to output schemas and paginate
-    return paginate([
-        AccountList.model_validate(entity)
-        for entity in entities
-    ])
+    # Convert to output schemas in one batch and paginate
+    return paginate(ACCOUNT_LIST_ADAPTER.validate_python(entities))
 
 @router.get(
     '/statements/me',
@@ -202,7 +203,7 @@ async def get_bank_statement(
             owner=current_user.uuid5
         )
     )
-    account = result.scalars().first()
+    account = result.scalar_one_or_none()
     
     if not account:
         raise HTTPException(
@@ -334,11 +335,8 @@ async def get_all_accounts(
     result = await db_session.execute(query)
     entities = result.scalars().all()
     
-    # Convert to output schemas and paginate
-    return paginate([
-        AccountOut.model_validate(entity)
-        for entity in entities
-    ])
+    # Convert to output schemas in one batch and paginate
+    return paginate(ACCOUNT_OUT_LIST_ADAPTER.validate_python(entities))
 
 @router.get(
     '/{account_id}',
@@ -372,7 +370,7 @@ async def get_account_by_id(
     result = await db_session.execute(
         select(AccountModel).filter_by(id=account_id)
     )
-    entity = result.scalars().first()
+    entity = result.scalar_one_or_none()
     
     if not entity:
         raise HTTPException(
@@ -424,7 +422,7 @@ async def update_account(
     result = await db_session.execute(
         select(AccountModel).filter_by(id=account_id)
     )
-    entity = result.scalars().first()
+    entity = result.scalar_one_or_none()
     
     if not entity:
         raise HTTPException(
@@ -491,7 +489,7 @@ async def delete_account(
     result = await db_session.execute(
         select(AccountModel).filter_by(id=account_id)
     )
-    entity = result.scalars().first()
+    entity = result.scalar_one_or_none()
     
     if not entity:
         raise HTTPException(
@@ -44,10 +44,12 @@ class AccountModel(BaseModel):
         UUID(as_uuid=True),
         ForeignKey('users.uuid5'),
         nullable=False,
+        index=True,
     )
+    # Never loaded implicitly - the owner's UUID is on the row itself
     owner_user: Mapped['UserModel'] = relationship(
         back_populates="accounts",
-        lazy='selectin'
+        lazy='raise'
     )
     account_type: Mapped[AccountType] = mapped_column(
         Enum(AccountType, values_callable=lambda x: [e.value for e in x]),
@@ -100,16 +102,18 @@ class AccountModel(BaseModel):
         comment='Amount already used from special withdrawal limit'
     )
 
+    # Never loaded implicitly - an account's history is unbounded and the row is
+    # often held under FOR UPDATE; query transactions directly where needed
     outgoing_transactions: Mapped[list['TransactionModel']] = relationship(
         foreign_keys='TransactionModel.origin_account_number',
         back_populates="origin_account",
-        lazy='selectin'
+        lazy='raise'
     )
     
     incoming_transactions: Mapped[list['TransactionModel']] = relationship(
         foreign_keys='TransactionModel.destination_account_number',
         back_populates="destination_account",
-        lazy='selectin'
+        lazy='raise'
     )
 
     def __repr__(self) -> str:
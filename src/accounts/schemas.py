@@ -6,7 +6,7 @@ Defines validation and serialization schemas for bank account operations.
 
 from datetime import datetime
 from typing import Annotated, Optional
-from pydantic import UUID5, Field, PositiveFloat, constr
+from pydantic import UUID5, ConfigDict, Field, PositiveFloat, constr
 from src.users.schemas import UserOut
 from src.contrib.schemas import BaseSchema, OutMixin
 from src.contrib.schemas import AccountType
@@ -96,6 +96,10 @@ class AccountUpdate(BaseSchema):
     
     Used for PATCH requests. All fields are optional for partial updates.
     """
+    # Rarely used - build validators on first use instead of at import
+    # (inherited by AccountAdminUpdate)
+    model_config = ConfigDict(defer_build=True)
+
     password: Annotated[
         Optional[str],
         Field(
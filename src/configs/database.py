@@ -28,12 +28,17 @@ from src.configs.settings import settings
 # echo=False: Disable SQL query logging (set to True for debugging)
 # pool_size: Number of connections to maintain in the pool
 # max_overflow: Maximum number of connections that can be created beyond pool_size
+# pool_recycle: Replace connections older than this many seconds
+# query_cache_size: Compiled SQL cache entries - headroom over the default 500 for the
+#   distinct select() shapes produced by the optional list filters
 engine = create_async_engine(
     settings.DB_URL,
-    echo=False,  # Set to True to log all SQL queries
-    # pool_pre_ping=True,  # Verify connections before using them
-    # pool_size=5,  # Number of connections in the pool
-    # max_overflow=10,  # Additional connections beyond pool_size
+    echo=False,  # Set to True to log all SQL queries ('debug' shows [cached since ...] markers)
+    query_cache_size=1200,
+    pool_pre_ping=True,  # Verify connections before using them
+    pool_size=settings.DB_POOL_SIZE,  # Number of connections in the pool
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Additional connections beyond pool_size
+    pool_recycle=settings.DB_POOL_RECYCLE,  # Avoid server/proxy-side idle disconnects
 )
 
 # Create async session factory
@@ -5,6 +5,8 @@ Handles application configuration using Pydantic Settings.
 Environment variables are automatically loaded from .env file.
 """
 
+import os
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -20,6 +22,21 @@ class Settings(BaseSettings):
         description='Database connection URL'
     )
     
+    DB_POOL_SIZE: int = Field(
+        default_factory=lambda: max(10, 2 * (os.cpu_count() or 1)),
+        description='Connections kept open in the pool per worker process'
+    )
+    
+    DB_MAX_OVERFLOW: int = Field(
+        default=20,
+        description='Extra connections allowed beyond DB_POOL_SIZE under load'
+    )
+    
+    DB_POOL_RECYCLE: int = Field(
+        default=1800,
+        description='Seconds after which pooled connections are replaced'
+    )
+    
     # Application Configuration
     APP_NAME: str = Field(
         default='bankAPI',
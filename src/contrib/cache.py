@@ -0,0 +1,67 @@
+"""
+In-Process Result Cache
+
+Provides a small time-based cache for read-heavy endpoints whose results can
+tolerate a few seconds of staleness.
+"""
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded key/value cache with per-entry expiration
+
+    Entries expire `ttl` seconds after being stored. When `maxsize` is reached
+    the oldest entry is evicted. The cache is per process - with several
+    workers each keeps its own copy, so staleness is bounded by `ttl`.
+
+    `clear()` bumps `generation`. A caller that awaits between `get()` and
+    `set()` passes the generation it started with, so a value loaded before a
+    concurrent `clear()` is not stored afterwards.
+
+    Example:
+        cache = TTLCache(maxsize=256, ttl=30)
+        page = cache.get(key)
+        if page is None:
+            generation = cache.generation
+            page = await load_page()
+            cache.set(key, page, generation=generation)
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key`, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store `value` under `key`, evicting the oldest entry when full
+
+        Skipped when `generation` is given and the cache was cleared since.
+        """
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and invalidate values still being loaded"""
+        self.generation += 1
+        self._entries.clear()
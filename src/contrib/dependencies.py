@@ -52,7 +52,7 @@ async def get_current_user(
     result = await db_session.execute(
         select(UserModel).filter_by(user_number=user_number)
     )
-    user = result.scalars().first()
+    user = result.scalar_one_or_none()
     
     if user is None:
         raise HTTPException(
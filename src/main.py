@@ -7,6 +7,7 @@ Customize the title, description, and version according to your project.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from src.routers import api_router
 from fastapi_pagination import add_pagination
 from contextlib import asynccontextmanager
@@ -30,6 +31,7 @@ app = FastAPI(
     version='0.1.0',
     docs_url='/docs',  # Swagger UI
     redoc_url='/redoc',  # ReDoc disabled
+    default_response_class=ORJSONResponse,  # orjson renders response bodies in C
     lifespan=lifespan
 )
 
@@ -9,18 +9,23 @@ from uuid import uuid4
 from typing import Optional
 
 from fastapi import APIRouter, Body, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
+from sqlalchemy import func
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from fastapi_pagination import Page, paginate
+from fastapi_pagination import Page, resolve_params
+from fastapi_pagination.ext.sqlalchemy import paginate
 
 from src.accounts.models import AccountModel
+from src.contrib.cache import TTLCache
 from src.contrib.schemas import TransactionType
 from src.contrib.dependencies import DatabaseDependency, CurrentUser
 from src.contrib.dependencies import RequireAdmin
 from .schemas import (
     TransactionIn,
     TransactionOut,
+    TransactionCreateOut,
     TransactionList
 )
 from .models import TransactionModel
@@ -28,13 +33,57 @@ from .models import TransactionModel
 
 router = APIRouter()
 
+# Columns serialized by TransactionOut - the export selects only these
+TRANSACTION_OUT_COLUMNS = (
+    TransactionModel.id,
+    TransactionModel.created_at,
+    TransactionModel.value,
+    TransactionModel.transaction_type,
+    TransactionModel.origin_account_number,
+    TransactionModel.destination_account_number,
+)
+
+# Columns serialized by TransactionList - list endpoints select only these
+TRANSACTION_LIST_COLUMNS = (
+    TransactionModel.id,
+    TransactionModel.created_at,
+    TransactionModel.value,
+    TransactionModel.transaction_type,
+    TransactionModel.origin_account_number,
+)
+
+# Rows fetched per round-trip when streaming the transaction export
+EXPORT_BATCH_SIZE = 1000
+
+# Admin listing pages keyed by (page, size, value, transaction_type) - dropped
+# whenever this process registers a transaction, otherwise stale for at most 30s
+admin_transactions_cache = TTLCache(maxsize=256, ttl=30)
+
+
+def _construct_transactions(rows) -> list[TransactionList]:
+    """Build TransactionList from projected rows without re-validating database values"""
+    return [TransactionList.model_construct(**row._mapping) for row in rows]
+
+
+def _construct_created(transaction_model: TransactionModel, origin_balance_after: float) -> TransactionCreateOut:
+    """Build the POST /transactions response from the stored transaction and resulting balance"""
+    return TransactionCreateOut.model_construct(
+        id=transaction_model.id,
+        created_at=transaction_model.created_at,
+        origin_account_number=transaction_model.origin_account_number,
+        destination_account_number=transaction_model.destination_account_number,
+        value=transaction_model.value,
+        transaction_type=transaction_model.transaction_type,
+        origin_balance_after=origin_balance_after
+    )
+
 
 @router.post(
     '/',
     summary='Register a new transaction',
     description='Register a new transaction with the provided data (requires authentication)',
     status_code=status.HTTP_201_CREATED,
-    response_model=TransactionOut
+    response_model=TransactionCreateOut
 )
 async def register_transaction(
     db_session: DatabaseDependency,
@@ -53,7 +102,7 @@ async def register_transaction(
         transaction_in: Transaction data including account, value, and type
         
     Returns:
-        TransactionOut: Created transaction information
+        TransactionCreateOut: Created transaction with the origin account balance after it
         
     Raises:
         HTTPException 401: If authentication fails
@@ -62,45 +111,64 @@ async def register_transaction(
         HTTPException 400: If withdrawal limits exceeded or insufficient balance
         HTTPException 500: If database error occurs
     """
+    # Single timestamp for the transaction and the daily withdrawal window
+    now = datetime.now(timezone.utc)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    
     try:
-        if transaction_in.transaction_type == TransactionType.TRANSFER:
-            if not transaction_in.destination_account_number:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail='Destination account number must be provided for transfer transactions'
-                )
-            transaction_out = TransactionOut(
-            id=uuid4(),
-            created_at=datetime.now(timezone.utc),
-            **transaction_in.model_dump()
-            )
-        else:
-            transaction_out = TransactionOut(
-                id=uuid4(),
-                created_at=datetime.now(timezone.utc),
-                **transaction_in.model_dump(exclude={'destination_account_number'})
+        is_transfer = transaction_in.transaction_type == TransactionType.TRANSFER
+        if is_transfer and not transaction_in.destination_account_number:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='Destination account number must be provided for transfer transactions'
             )
         
-        # Create database model from output schema
-        transaction_model = TransactionModel(**transaction_out.model_dump())
+        # Create database model straight from the validated input
+        transaction_model = TransactionModel(
+            id=uuid4(),
+            created_at=now,
+            origin_account_number=transaction_in.origin_account_number,
+            destination_account_number=transaction_in.destination_account_number if is_transfer else None,
+            value=transaction_in.value,
+            transaction_type=transaction_in.transaction_type
+        )
         
         # Set necessary values to validate the transaction
         value = transaction_in.value
         transaction_type = transaction_in.transaction_type
         
-        # Query account by account_number (not primary key)
+        # Today's withdrawals for the account, correlated into the account query
+        withdrawals_today_subquery = select(func.count()).select_from(TransactionModel).where(
+            TransactionModel.origin_account_number == AccountModel.account_number,
+            TransactionModel.transaction_type == TransactionType.WITHDRAWAL,
+            TransactionModel.created_at >= today_start
+        ).scalar_subquery()
+        
+        # Lock every account the transaction touches for the rest of the transaction
+        # and fetch them along with the withdrawal count in one round-trip. Rows are
+        # locked in account_number order, so opposite concurrent transfers can't
+        # deadlock. populate_existing refreshes instances the session already holds
+        locked_numbers = {transaction_in.origin_account_number}
+        if is_transfer:
+            locked_numbers.add(transaction_in.destination_account_number)
         result = await db_session.execute(
-            select(AccountModel).filter(AccountModel.account_number == transaction_in.origin_account_number)
+            select(AccountModel, withdrawals_today_subquery.label('withdrawals_today'))
+            .filter(AccountModel.account_number.in_(locked_numbers))
+            .order_by(AccountModel.account_number)
+            .with_for_update(of=AccountModel)
+            .execution_options(populate_existing=True)
         )
-        account_model = result.scalar_one_or_none()
+        locked_rows = {row.AccountModel.account_number: row for row in result}
+        row = locked_rows.get(transaction_in.origin_account_number)
         
         # Check if account exists before accessing attributes
-        if not account_model:
+        if not row:
             await db_session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f'Account with number {transaction_in.origin_account_number} not found'
             )
+        account_model, withdrawals_today = row
         
         # Get account attributes
         withdraw_limit = account_model.daily_withdrawal_limit
@@ -108,13 +176,6 @@ async def register_transaction(
         balance = account_model.balance
         used_special_withdraw = account_model.used_special_withdrawal
         
-        # Build and execute withdrawal query for later use
-        account_withdrawals_today_query = select(TransactionModel).filter(
-            TransactionModel.origin_account_number == transaction_in.origin_account_number,
-            TransactionModel.transaction_type == TransactionType.WITHDRAWAL,
-            TransactionModel.created_at >= datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        )
-        
         # Check permissions
         if account_model.owner != current_user.uuid5 and not current_user.is_superuser:
             await db_session.rollback()
@@ -136,16 +197,15 @@ async def register_transaction(
             else:
                 account_model.balance += value
             
-            db_session.add(account_model)
             db_session.add(transaction_model)
+            transaction_out = _construct_created(transaction_model, account_model.balance)
             await db_session.commit()
+            admin_transactions_cache.clear()
             return transaction_out
         
         if transaction_type == TransactionType.WITHDRAWAL:
             # Check daily withdrawal limit
-            result = await db_session.execute(account_withdrawals_today_query)
-            withdrawals_today = result.scalars().all()
-            if len(withdrawals_today) >= withdraw_limit:
+            if withdrawals_today >= withdraw_limit:
                 await db_session.rollback()
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -166,9 +226,10 @@ async def register_transaction(
             else:
                 account_model.balance -= value
             
-            db_session.add(account_model)
             db_session.add(transaction_model)
+            transaction_out = _construct_created(transaction_model, account_model.balance)
             await db_session.commit()
+            admin_transactions_cache.clear()
             return transaction_out
         
         if transaction_type == TransactionType.TRANSFER:
@@ -180,13 +241,10 @@ async def register_transaction(
                     detail='Insufficient funds for this transfer'
                 )
             
-            # Query destination account by account_number
-            dest_result = await db_session.execute(
-                select(AccountModel).filter(AccountModel.account_number == transaction_in.destination_account_number)
-            )
-            destination_account_model = dest_result.scalar_one_or_none()
+            # Destination account was locked together with the origin above
+            dest_row = locked_rows.get(transaction_in.destination_account_number)
             
-            if not destination_account_model:
+            if not dest_row:
                 await db_session.rollback()
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -194,12 +252,13 @@ async def register_transaction(
                 )
             
             # Perform transfer
+            destination_account_model = dest_row.AccountModel
             account_model.balance -= value
             destination_account_model.balance += value
-            db_session.add(account_model)
-            db_session.add(destination_account_model)
             db_session.add(transaction_model)
+            transaction_out = _construct_created(transaction_model, account_model.balance)
             await db_session.commit()
+            admin_transactions_cache.clear()
             return transaction_out
     except IntegrityError as e:
         await db_session.rollback()
@@ -222,7 +281,7 @@ async def register_transaction(
     summary='List all logged user\'s transactions',
     description='Retrieves a paginated list of all transactions with optional filtering',
     status_code=status.HTTP_200_OK,
-    response_model=Page[TransactionOut],
+    response_model=Page[TransactionList],
 )
 async def get_all_transactions(
     db_session: DatabaseDependency,
@@ -235,7 +294,7 @@ async def get_all_transactions(
         None,
         description='Filter by transaction type (deposit or withdrawal)'
     ),
-) -> Page[TransactionOut]:
+) -> Page[TransactionList]:
     """
     Get all example entities with optional filters
     
@@ -251,7 +310,7 @@ async def get_all_transactions(
         GET /examples?name=test&is_active=true&page=1&size=10
     """
     # Start with base query
-    query = select(TransactionModel).filter(TransactionModel.origin_account_number.in_(
+    query = select(*TRANSACTION_LIST_COLUMNS).filter(TransactionModel.origin_account_number.in_(
         select(AccountModel.account_number).filter(AccountModel.owner == current_user.uuid5)
         ))
     
@@ -265,22 +324,15 @@ async def get_all_transactions(
     # Add ordering
     query = query.order_by(TransactionModel.created_at.desc())
     
-    # Execute query
-    result = await db_session.execute(query)
-    transactions = result.scalars().all()
-    
-    # Convert to output schemas and paginate
-    return paginate([
-        TransactionOut.model_validate(transaction)
-        for transaction in transactions
-    ])
+    # Paginate in SQL - only the requested page is fetched and converted
+    return await paginate(db_session, query, transformer=_construct_transactions)
 
 @router.get(
     '/',
     summary='List all transactions (Admin only)',
     description='Retrieves a paginated list of all transactions with optional filtering',
     status_code=status.HTTP_200_OK,
-    response_model=Page[TransactionOut],
+    response_model=Page[TransactionList],
 )
 async def get_all_transactions(
     db_session: DatabaseDependency,
@@ -293,7 +345,7 @@ async def get_all_transactions(
         None,
         description='Filter by transaction type (deposit or withdrawal)'
     ),
-) -> Page[TransactionOut]:
+) -> Page[TransactionList]:
     """
     Get all example entities with optional filters
     
@@ -308,8 +360,17 @@ async def get_all_transactions(
     Example:
         GET /examples?name=test&is_active=true&page=1&size=10
     """
+    # Serve repeated page navigation from the short-lived cache
+    params = resolve_params()
+    cache_key = (params.page, params.size, value, transaction_type)
+    cached_page = admin_transactions_cache.get(cache_key)
+    if cached_page is not None:
+        return cached_page
+    # A write committed while the page loads clears the cache - don't store the stale page
+    cache_generation = admin_transactions_cache.generation
+    
     # Start with base query
-    query = select(TransactionModel)
+    query = select(*TRANSACTION_LIST_COLUMNS)
     
     # Apply filters if provided
     if value is not None:
@@ -321,15 +382,69 @@ async def get_all_transactions(
     # Add ordering
     query = query.order_by(TransactionModel.created_at.desc())
     
-    # Execute query
-    result = await db_session.execute(query)
-    transactions = result.scalars().all()
+    # Paginate in SQL - only the requested page is fetched and converted
+    page = await paginate(db_session, query, transformer=_construct_transactions)
+    admin_transactions_cache.set(cache_key, page, generation=cache_generation)
+    return page
+
+
+@router.get(
+    '/export',
+    summary='Export all transactions (Admin only)',
+    description='Streams every transaction matching the filters as newline-delimited JSON',
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def export_transactions(
+    db_session: DatabaseDependency,
+    admin: RequireAdmin,  # Requires admin privileges
+    value: Optional[float] = Query(
+        None,
+        description='Filter by transaction value - greater than or equal to'
+    ),
+    transaction_type: Optional[TransactionType] = Query(
+        None,
+        description='Filter by transaction type (deposit or withdrawal)'
+    ),
+) -> StreamingResponse:
+    """
+    Export all transactions as NDJSON (Admin only)
+    
+    Rows are read through a server-side cursor and written out as they
+    arrive, so the first bytes are sent before the query finishes and
+    memory stays bounded by the batch size.
+    
+    Args:
+        db_session: Database session (injected)
+        admin: Current admin user (validated)
+        value: Optional minimum value filter
+        transaction_type: Optional transaction type filter
+        
+    Returns:
+        StreamingResponse: One TransactionOut JSON object per line
+        
+    Example:
+        GET /transactions/export?transaction_type=withdrawal
+        Authorization: Bearer <admin_jwt_token>
+    """
+    query = select(*TRANSACTION_OUT_COLUMNS)
+    
+    if value is not None:
+        query = query.filter(TransactionModel.value >= value)
+    
+    if transaction_type is not None:
+        query = query.filter(TransactionModel.transaction_type == transaction_type)
+    
+    query = query.order_by(TransactionModel.created_at.desc())
+    
+    async def generate_lines():
+        result = await db_session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for row in result:
+            yield TransactionOut.model_construct(**row._mapping).model_dump_json() + '\n'
     
-    # Convert to output schemas and paginate
-    return paginate([
-        TransactionOut.model_validate(transaction)
-        for transaction in transactions
-    ])
+    return StreamingResponse(generate_lines(), media_type='application/x-ndjson')
 
 
 @router.get(
@@ -363,7 +478,7 @@ async def get_transaction_by_id(
     result = await db_session.execute(
         select(TransactionModel).filter_by(id=transaction_id)
     )
-    transaction = result.scalars().first()
+    transaction = result.scalar_one_or_none()
     
     if not transaction:
         raise HTTPException(
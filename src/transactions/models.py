@@ -10,12 +10,41 @@ from sqlalchemy import UUID, DateTime, ForeignKey, Integer, String, Float, Boole
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.contrib.models import BaseModel
 from src.contrib.schemas import TransactionType
-from sqlalchemy import Enum
+from sqlalchemy import Index, SmallInteger, TypeDecorator
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from src.accounts.models import AccountModel
 
+
+class TransactionTypeColumn(TypeDecorator):
+    """
+    Stores TransactionType as a SMALLINT code
+
+    Codes are part of the storage format - append new members, never renumber.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    CODES = {
+        TransactionType.DEPOSIT: 0,
+        TransactionType.WITHDRAWAL: 1,
+        TransactionType.TRANSFER: 2,
+    }
+    MEMBERS = {code: member for member, code in CODES.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self.CODES[TransactionType(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.MEMBERS[value]
+
+
 class TransactionModel(BaseModel):
     """
     Transaction Database Model
@@ -32,13 +61,27 @@ class TransactionModel(BaseModel):
     """
     
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Covers the daily withdrawal count and the created_at ordering of list endpoints
+        Index(
+            'ix_tx_origin_type_created',
+            'origin_account_number',
+            'transaction_type',
+            'created_at'
+        ),
+        # Serves the per-account listing ordered by created_at without a type filter
+        Index(
+            'ix_tx_origin_created',
+            'origin_account_number',
+            'created_at'
+        ),
+    )
     
     pk_id: Mapped[UUIDType] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid4,
         nullable=False,
-        index=True,
         comment='Primary key'
     )
 
@@ -70,21 +113,22 @@ class TransactionModel(BaseModel):
     )
 
     transaction_type: Mapped[TransactionType] = mapped_column(
-        Enum(TransactionType, values_callable=lambda x: [e.value for e in x]),
+        TransactionTypeColumn(),
         nullable=False,
-        comment='Type of transaction (e.g., deposit, withdrawal)'
+        comment='Type of transaction (0=deposit, 1=withdrawal, 2=transfer)'
     )
 
+    # Never loaded implicitly - opt in with selectinload() where an account is needed
     origin_account: Mapped['AccountModel'] = relationship(
         back_populates="outgoing_transactions",
         foreign_keys=[origin_account_number],
-        lazy='selectin'
+        lazy='raise'
     )
     
     destination_account: Mapped[Optional['AccountModel']] = relationship(
         back_populates="incoming_transactions",
         foreign_keys=[destination_account_number],
-        lazy='selectin'
+        lazy='raise'
     )
 
     def __repr__(self) -> str:
@@ -4,6 +4,7 @@ Transaction Pydantic Schemas
 Defines validation and serialization schemas for transaction operations.
 """
 
+from datetime import datetime
 from typing import Annotated, Optional
 from pydantic import UUID4, Field, PositiveFloat, constr
 from src.contrib.schemas import BaseSchema, OutMixin,TransactionType
@@ -79,17 +80,34 @@ class TransactionOut(Transaction, OutMixin):
     ]
 
 
+class TransactionCreateOut(TransactionOut):
+    """
+    Output Schema for a Registered Transaction
+    
+    Returned by POST /transactions. Adds the origin account balance after the
+    transaction so clients don't need a second request to read it.
+    """
+    origin_balance_after: Annotated[
+        float,
+        Field(
+            description='Origin account balance after the transaction',
+            example=1100.50
+        )
+    ]
+
+
 class TransactionList(BaseSchema):
     """
     Simplified Schema for List Responses
     
-    Used for GET /transactions endpoint.
+    Used for GET /transactions and GET /transactions/me endpoints.
     """
     
+    id: Annotated[UUID4, Field(description='Unique identifier (see GET /transactions/{id})')]
     value: Annotated[float, Field(description='Transaction value')]
     transaction_type: Annotated[TransactionType, Field(description='Type of transaction')]
     created_at: Annotated[
-        Optional[str],
+        datetime,
         Field(description='Timestamp when the transaction was created')
     ]
     origin_account_number: Annotated[
@@ -9,7 +9,7 @@ from uuid import uuid5
 from typing import Optional
 
 from fastapi import APIRouter, Body, HTTPException, Query, status
-from pydantic import UUID5
+from pydantic import UUID5, TypeAdapter
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from fastapi_pagination import Page, paginate
@@ -29,6 +29,9 @@ from .auth import hash_password, verify_password, create_access_token
 
 router = APIRouter()
 
+# Batch validator for the user listing - one pydantic-core call per result set
+USER_OUT_LIST_ADAPTER = TypeAdapter(list[UserOut])
+
 
 @router.post(
     '/register',
@@ -71,7 +74,7 @@ async def register(
         result = await db_session.execute(
             select(UserModel).filter_by(user_number=user_in.user_number)
         )
-        if result.scalars().first():
+        if result.scalar_one_or_none():
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail='User number already exists'
@@ -81,7 +84,7 @@ async def register(
         result = await db_session.execute(
             select(UserModel).filter_by(email=user_in.email)
         )
-        if result.scalars().first():
+        if result.scalar_one_or_none():
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail='Email already registered'
@@ -167,7 +170,7 @@ async def login(
             (UserModel.user_number == credentials.user_number)
         )
     )
-    user = result.scalars().first()
+    user = result.scalar_one_or_none()
     
     # Validate user exists and password is correct
     if not user or not verify_password(credentials.password, user.hashed_password):
@@ -329,7 +332,7 @@ async def list_users(
     result = await db_session.execute(query)
     users = result.scalars().all()
     
-    return paginate([UserOut.model_validate(user) for user in users])
+    return paginate(USER_OUT_LIST_ADAPTER.validate_python(users))
 
 
 @router.delete(
@@ -366,10 +369,8 @@ async def delete_user(
             detail='Cannot delete your own account'
         )
     
-    result = await db_session.execute(
-        select(UserModel).filter_by(uuid5=user_id)
-    )
-    user = result.scalars().first()
+    # uuid5 is the primary key, so this is served from the identity map when loaded
+    user = await db_session.get(UserModel, user_id)
     
     if not user:
         raise HTTPException(
@@ -5,6 +5,7 @@ This file defines the database schema for users and authentication.
 """
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from uuid import UUID as UUIDType, uuid5,  NAMESPACE_DNS
 from sqlalchemy import DateTime, Integer, String, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -36,7 +37,6 @@ class UserModel(BaseModel):
         UUID(as_uuid=True),
         primary_key=True,
         nullable=False,
-        index=True,
         comment='uuid5 unique user identifier'
     )
     
@@ -89,14 +89,17 @@ class UserModel(BaseModel):
         comment='Account creation timestamp'
     )
 
+    # Never loaded implicitly - every authenticated request fetches the user,
+    # opt in with selectinload(UserModel.accounts) where the accounts are needed
     accounts: Mapped[List['AccountModel']] = relationship(
         back_populates="owner_user",
-        lazy='selectin'
+        lazy='raise'
     )
 
-    @classmethod
-    def generate_uuid_from_id_number(cls, id_number: int) -> UUIDType:
-        """Generate deterministic UUID v5 from governmental ID number"""
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def generate_uuid_from_id_number(id_number: int) -> UUIDType:
+        """Generate deterministic UUID v5 from governmental ID number (memoized)"""
         return uuid5(NAMESPACE_DNS, str(id_number))
     
     def __repr__(self) -> str:
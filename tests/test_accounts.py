@@ -4,15 +4,29 @@ Tests for Account Endpoints
 Tests account creation, listing, retrieval, update, and deletion.
 """
 
+from datetime import datetime, timedelta, timezone
+from typing import Mapping
+from uuid import UUID
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.accounts.models import AccountModel
+
+
+# Statement filters take UTC dates; ISO-8601 strings compare in date order
+TODAY = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+YESTERDAY = (datetime.now(timezone.utc) - timedelta(days=1)).strftime('%Y-%m-%d')
+WEEK_AGO = (datetime.now(timezone.utc) - timedelta(days=7)).strftime('%Y-%m-%d')
 
 
 @pytest.mark.asyncio
 class TestAccountCreation:
     """Tests for account creation endpoint."""
     
-    async def test_create_savings_account(self, client: AsyncClient, auth_headers: dict):
+    async def test_create_savings_account(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test creating a savings account."""
         account_data = {
             "account_type": "savings",
@@ -28,7 +42,7 @@ class TestAccountCreation:
         assert "password" not in data
         assert "hashed_password" not in data
     
-    async def test_create_checking_account(self, client: AsyncClient, auth_headers: dict):
+    async def test_create_checking_account(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test creating a checking account."""
         account_data = {
             "account_type": "checking",
@@ -40,7 +54,7 @@ class TestAccountCreation:
         data = response.json()
         assert data["account_type"] == "checking"
     
-    async def test_create_business_account(self, client: AsyncClient, auth_headers: dict):
+    async def test_create_business_account(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test creating a business account."""
         account_data = {
             "account_type": "business",
@@ -62,7 +76,7 @@ class TestAccountCreation:
         response = await client.post("/accounts/", json=account_data)
         assert response.status_code == 401
     
-    async def test_create_account_invalid_type(self, client: AsyncClient, auth_headers: dict):
+    async def test_create_account_invalid_type(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test creating account with invalid type fails."""
         account_data = {
             "account_type": "invalid_type",
@@ -77,7 +91,7 @@ class TestAccountCreation:
 class TestAccountListing:
     """Tests for account listing endpoints."""
     
-    async def test_list_my_accounts(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_list_my_accounts(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test listing logged-in user's accounts."""
         response = await client.get("/accounts/me", headers=auth_headers)
         assert response.status_code == 200
@@ -88,7 +102,7 @@ class TestAccountListing:
         account_numbers = [acc["account_number"] for acc in data["items"]]
         assert test_account["account_number"] in account_numbers
     
-    async def test_list_my_accounts_filter_by_type(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_list_my_accounts_filter_by_type(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test filtering user's accounts by type."""
         response = await client.get(
             f"/accounts/me?account_type={test_account['account_type']}",
@@ -100,7 +114,7 @@ class TestAccountListing:
         for account in data["items"]:
             assert account["account_type"] == test_account["account_type"]
     
-    async def test_list_my_accounts_filter_by_active(self, client: AsyncClient, auth_headers: dict):
+    async def test_list_my_accounts_filter_by_active(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test filtering user's accounts by active status."""
         response = await client.get("/accounts/me?is_active=true", headers=auth_headers)
         assert response.status_code == 200
@@ -109,14 +123,14 @@ class TestAccountListing:
         for account in data["items"]:
             assert account["balance"] >= 0
     
-    async def test_list_all_accounts_as_admin(self, client: AsyncClient, test_account: dict, admin_headers: dict):
+    async def test_list_all_accounts_as_admin(self, client: AsyncClient, test_account: dict, admin_headers: Mapping[str, bytes]):
         """Test admin can list all accounts."""
         response = await client.get("/accounts/", headers=admin_headers)
         assert response.status_code == 200
         data = response.json()
         assert "items" in data
     
-    async def test_list_all_accounts_as_regular_user_fails(self, client: AsyncClient, auth_headers: dict):
+    async def test_list_all_accounts_as_regular_user_fails(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test regular user cannot list all accounts."""
         response = await client.get("/accounts/", headers=auth_headers)
         assert response.status_code == 403
@@ -131,7 +145,7 @@ class TestAccountListing:
 class TestAccountRetrieval:
     """Tests for account retrieval by ID."""
     
-    async def test_get_account_by_id_as_admin(self, client: AsyncClient, test_account: dict, admin_headers: dict):
+    async def test_get_account_by_id_as_admin(self, client: AsyncClient, test_account: dict, admin_headers: Mapping[str, bytes]):
         """Test admin can get account by ID."""
         response = await client.get(
             f"/accounts/{test_account['id']}",
@@ -141,7 +155,7 @@ class TestAccountRetrieval:
         data = response.json()
         assert data["account_number"] == test_account["account_number"]
     
-    async def test_get_account_by_id_as_regular_user_fails(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_get_account_by_id_as_regular_user_fails(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test regular user cannot get account by ID."""
         response = await client.get(
             f"/accounts/{test_account['id']}",
@@ -149,7 +163,7 @@ class TestAccountRetrieval:
         )
         assert response.status_code == 403
     
-    async def test_get_nonexistent_account(self, client: AsyncClient, admin_headers: dict):
+    async def test_get_nonexistent_account(self, client: AsyncClient, admin_headers: Mapping[str, bytes]):
         """Test getting non-existent account returns 404."""
         fake_uuid = "550e8400-e29b-41d4-a716-446655440000"
         response = await client.get(
@@ -163,7 +177,7 @@ class TestAccountRetrieval:
 class TestAccountUpdate:
     """Tests for account update endpoint."""
     
-    async def test_update_account_as_admin(self, client: AsyncClient, test_account: dict, admin_headers: dict):
+    async def test_update_account_as_admin(self, client: AsyncClient, test_account: dict, admin_headers: Mapping[str, bytes]):
         """Test admin can update account."""
         update_data = {
             "password": "NewAccountPass123!"
@@ -176,7 +190,7 @@ class TestAccountUpdate:
         )
         assert response.status_code == 200
     
-    async def test_update_account_as_regular_user_fails(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_update_account_as_regular_user_fails(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test regular user cannot update account."""
         update_data = {
             "password": "NewAccountPass123!"
@@ -189,7 +203,7 @@ class TestAccountUpdate:
         )
         assert response.status_code == 403
     
-    async def test_update_nonexistent_account(self, client: AsyncClient, admin_headers: dict):
+    async def test_update_nonexistent_account(self, client: AsyncClient, admin_headers: Mapping[str, bytes]):
         """Test updating non-existent account returns 404."""
         fake_uuid = "550e8400-e29b-41d4-a716-446655440000"
         update_data = {
@@ -208,7 +222,7 @@ class TestAccountUpdate:
 class TestAccountDeletion:
     """Tests for account deletion endpoint."""
     
-    async def test_delete_account_as_admin(self, client: AsyncClient, test_account: dict, admin_headers: dict):
+    async def test_delete_account_as_admin(self, client: AsyncClient, test_account: dict, admin_headers: Mapping[str, bytes]):
         """Test admin can delete account."""
         response = await client.delete(
             f"/accounts/{test_account['id']}",
@@ -223,7 +237,7 @@ class TestAccountDeletion:
         )
         assert get_response.status_code == 404
     
-    async def test_delete_account_as_regular_user_fails(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_delete_account_as_regular_user_fails(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test regular user cannot delete account."""
         response = await client.delete(
             f"/accounts/{test_account['id']}",
@@ -231,7 +245,7 @@ class TestAccountDeletion:
         )
         assert response.status_code == 403
     
-    async def test_delete_nonexistent_account(self, client: AsyncClient, admin_headers: dict):
+    async def test_delete_nonexistent_account(self, client: AsyncClient, admin_headers: Mapping[str, bytes]):
         """Test deleting non-existent account returns 404."""
         fake_uuid = "550e8400-e29b-41d4-a716-446655440000"
         response = await client.delete(
@@ -245,29 +259,44 @@ class TestAccountDeletion:
 class TestAccountPagination:
     """Tests for account pagination."""
     
-    async def test_pagination_page_size(self, client: AsyncClient, auth_headers: dict):
+    async def test_pagination_page_size(
+        self,
+        client: AsyncClient,
+        test_db: AsyncSession,
+        test_user: dict,
+        auth_headers: Mapping[str, bytes]
+    ):
         """Test pagination with custom page size."""
-        # Create multiple accounts
-        for i in range(5):
-            account_data = {
-                "account_type": "savings",
-                "password": f"AccountPass{i}123!"
-            }
-            await client.post("/accounts/", headers=auth_headers, json=account_data)
+        # Seed accounts directly - only the listing is under test
+        now = datetime.now(timezone.utc)
+        await test_db.execute(
+            insert(AccountModel).values([
+                {
+                    "owner": UUID(test_user["uuid5"]),
+                    "account_type": "savings",
+                    "hashed_password": "x",
+                    "is_active": True,
+                    "created_at": now,
+                }
+                for _ in range(5)
+            ])
+        )
+        await test_db.commit()
         
         # Test pagination
         response = await client.get("/accounts/me?page=1&size=2", headers=auth_headers)
         assert response.status_code == 200
         data = response.json()
         assert "items" in data
-        assert len(data["items"]) <= 2
+        assert len(data["items"]) == 2
+        assert data["total"] == 5
 
 
 @pytest.mark.asyncio
 class TestBankStatement:
     """Tests for bank statement endpoint."""
     
-    async def test_get_statement_basic(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_get_statement_basic(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test getting basic bank statement without date filters."""
         response = await client.get(
             f"/accounts/statements/me?account_number={test_account['account_number']}",
@@ -281,7 +310,7 @@ class TestBankStatement:
         assert "transactions" in data
         assert isinstance(data["transactions"], list)
     
-    async def test_get_statement_with_transactions(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_get_statement_with_transactions(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test getting statement includes transactions."""
         # Create some transactions
         deposit_data = {
@@ -315,12 +344,10 @@ class TestBankStatement:
             assert "created_at" in txn
             assert "origin_account_number" in txn
     
-    async def test_get_statement_with_initial_date(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_get_statement_with_initial_date(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test filtering statement by initial date."""
-        from datetime import datetime, timedelta
-        
         # Use a recent date
-        initial_date = (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d')
+        initial_date = YESTERDAY
         
         response = await client.get(
             f"/accounts/statements/me?account_number={test_account['account_number']}&initial_date={initial_date}",
@@ -332,16 +359,12 @@ class TestBankStatement:
         
         # Verify all transactions are after initial_date
         for txn in data["transactions"]:
-            txn_date = datetime.fromisoformat(txn["created_at"].replace('Z', '+00:00'))
-            filter_date = datetime.fromisoformat(initial_date)
-            assert txn_date.date() >= filter_date.date()
+            assert txn["created_at"][:10] >= initial_date
     
-    async def test_get_statement_with_final_date(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_get_statement_with_final_date(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test filtering statement by final date."""
-        from datetime import datetime
-        
         # Use current date
-        final_date = datetime.utcnow().strftime('%Y-%m-%d')
+        final_date = TODAY
         
         response = await client.get(
             f"/accounts/statements/me?account_number={test_account['account_number']}&final_date={final_date}",
@@ -353,14 +376,10 @@ class TestBankStatement:
         
         # Verify all transactions are before or on final_date
         for txn in data["transactions"]:
-            txn_date = datetime.fromisoformat(txn["created_at"].replace('Z', '+00:00'))
-            filter_date = datetime.fromisoformat(final_date)
-            assert txn_date.date() <= filter_date.date()
+            assert txn["created_at"][:10] <= final_date
     
-    async def test_get_statement_with_date_range(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_get_statement_with_date_range(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test filtering statement by date range."""
-        from datetime import datetime, timedelta
-        
         # Create transactions
         deposit_data = {
             "value": 100.0,
@@ -370,8 +389,8 @@ class TestBankStatement:
         await client.post("/transactions/", headers=auth_headers, json=deposit_data)
         
         # Set date range
-        initial_date = (datetime.utcnow() - timedelta(days=7)).strftime('%Y-%m-%d')
-        final_date = datetime.utcnow().strftime('%Y-%m-%d')
+        initial_date = WEEK_AGO
+        final_date = TODAY
         
         response = await client.get(
             f"/accounts/statements/me?account_number={test_account['account_number']}&initial_date={initial_date}&final_date={final_date}",
@@ -383,12 +402,9 @@ class TestBankStatement:
         
         # Verify transactions are within date range
         for txn in data["transactions"]:
-            txn_date = datetime.fromisoformat(txn["created_at"].replace('Z', '+00:00'))
-            start_date = datetime.fromisoformat(initial_date)
-            end_date = datetime.fromisoformat(final_date)
-            assert start_date.date() <= txn_date.date() <= end_date.date()
+            assert initial_date <= txn["created_at"][:10] <= final_date
     
-    async def test_get_statement_nonexistent_account(self, client: AsyncClient, auth_headers: dict):
+    async def test_get_statement_nonexistent_account(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test getting statement for non-existent account returns 404."""
         fake_account_number = 99999999  # Valid int32 value
         response = await client.get(
@@ -398,7 +414,7 @@ class TestBankStatement:
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
     
-    async def test_get_statement_other_users_account(self, client: AsyncClient, test_account: dict, admin_headers: dict):
+    async def test_get_statement_other_users_account(self, client: AsyncClient, test_account: dict, admin_headers: Mapping[str, bytes]):
         """Test getting statement for account not owned by user returns 404."""
         # Try to access test_account (owned by regular user) with admin credentials
         # This should fail because the endpoint checks ownership
@@ -416,7 +432,7 @@ class TestBankStatement:
         )
         assert response.status_code == 401
     
-    async def test_get_statement_missing_account_number(self, client: AsyncClient, auth_headers: dict):
+    async def test_get_statement_missing_account_number(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test getting statement without account_number parameter fails."""
         response = await client.get(
             "/accounts/statements/me",
@@ -424,22 +440,14 @@ class TestBankStatement:
         )
         assert response.status_code == 422
     
-    async def test_get_statement_balance_accuracy(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_get_statement_balance_accuracy(self, client: AsyncClient, funded_test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test that statement balance reflects account balance."""
         response = await client.get(
-            f"/accounts/statements/me?account_number={test_account['account_number']}",
+            f"/accounts/statements/me?account_number={funded_test_account['account_number']}",
             headers=auth_headers
         )
         assert response.status_code == 200
         data = response.json()
         
-        # Get account directly
-        accounts_response = await client.get("/accounts/me", headers=auth_headers)
-        accounts_data = accounts_response.json()
-        account = next(
-            (acc for acc in accounts_data["items"] if acc["account_number"] == test_account["account_number"]),
-            None
-        )
-        
-        if account:
-            assert data["balance"] == account["balance"]
+        # Non-zero balance, so a failed lookup falling back to 0.0 can't pass
+        assert data["balance"] == 10000.00
@@ -4,8 +4,15 @@ Tests for Authentication Endpoints
 Tests user registration, login, profile management, and admin operations.
 """
 
+from typing import Mapping
+from uuid import UUID
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.users.auth import verify_password
+from src.users.models import UserModel
 
 
 @pytest.mark.asyncio
@@ -32,63 +39,45 @@ class TestUserRegistration:
         assert data["is_active"] is True
         assert data["is_superuser"] is False
     
-    async def test_register_duplicate_user_number(self, client: AsyncClient, test_user: dict):
-        """Test registration with duplicate user number fails."""
-        user_data = {
-            "user_number": test_user["user_number"],
-            "user_fullname": "Jane Doe",
-            "email": "different@example.com",
-            "password": "SecurePass123!"
-        }
-        
-        response = await client.post("/auth/register", json=user_data)
-        assert response.status_code == 409
-        assert "already exists" in response.json()["detail"].lower()
-    
-    async def test_register_duplicate_email(self, client: AsyncClient, test_user: dict):
-        """Test registration with duplicate email fails."""
+    @pytest.mark.parametrize(
+        "field,detail",
+        [
+            ("user_number", "already exists"),
+            ("email", "already"),
+        ],
+        ids=["duplicate_user_number", "duplicate_email"]
+    )
+    async def test_register_duplicate(self, client: AsyncClient, test_user: dict, field: str, detail: str):
+        """Test registration reusing the test user's user number or email fails."""
         user_data = {
             "user_number": "999888777",
             "user_fullname": "Jane Doe",
-            "email": test_user["email"],
-            "password": "SecurePass123!"
+            "email": "different@example.com",
+            "password": "SecurePass123!",
+            field: test_user[field]
         }
         
         response = await client.post("/auth/register", json=user_data)
         assert response.status_code == 409
-        assert "already" in response.json()["detail"].lower()
-    
-    async def test_register_invalid_email(self, client: AsyncClient):
-        """Test registration with invalid email fails."""
-        user_data = {
-            "user_number": "111222333",
-            "user_fullname": "John Doe",
-            "email": "invalid-email",
-            "password": "SecurePass123!"
-        }
-        
-        response = await client.post("/auth/register", json=user_data)
-        assert response.status_code == 422
-    
-    async def test_register_weak_password(self, client: AsyncClient):
-        """Test registration with weak password fails."""
+        assert detail in response.json()["detail"].lower()
+    
+    @pytest.mark.parametrize(
+        "field,value",
+        [
+            ("email", "invalid-email"),
+            ("password", "weak"),
+            ("user_fullname", "John"),  # Only one name
+        ],
+        ids=["invalid_email", "weak_password", "invalid_fullname"]
+    )
+    async def test_register_invalid_payload(self, client: AsyncClient, field: str, value: str):
+        """Test registration with an invalid field fails validation."""
         user_data = {
             "user_number": "111222333",
             "user_fullname": "John Doe",
             "email": "john@example.com",
-            "password": "weak"
-        }
-        
-        response = await client.post("/auth/register", json=user_data)
-        assert response.status_code == 422
-    
-    async def test_register_invalid_fullname(self, client: AsyncClient):
-        """Test registration with invalid full name fails."""
-        user_data = {
-            "user_number": "111222333",
-            "user_fullname": "John",  # Only one name
-            "email": "john@example.com",
-            "password": "SecurePass123!"
+            "password": "SecurePass123!",
+            field: value
         }
         
         response = await client.post("/auth/register", json=user_data)
@@ -139,7 +128,7 @@ class TestUserLogin:
 class TestCurrentUser:
     """Tests for current user endpoints."""
     
-    async def test_get_current_user(self, client: AsyncClient, test_user: dict, auth_headers: dict):
+    async def test_get_current_user(self, client: AsyncClient, test_user: dict, auth_headers: Mapping[str, bytes]):
         """Test getting current user information."""
         response = await client.get("/auth/me", headers=auth_headers)
         assert response.status_code == 200
@@ -153,7 +142,7 @@ class TestCurrentUser:
         response = await client.get("/auth/me")
         assert response.status_code == 401
     
-    async def test_update_current_user_email(self, client: AsyncClient, auth_headers: dict):
+    async def test_update_current_user_email(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test updating current user email."""
         update_data = {
             "email": "newemail@example.com"
@@ -164,7 +153,7 @@ class TestCurrentUser:
         data = response.json()
         assert data["email"] == update_data["email"]
     
-    async def test_update_current_user_fullname(self, client: AsyncClient, auth_headers: dict):
+    async def test_update_current_user_fullname(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test updating current user full name."""
         update_data = {
             "user_fullname": "Updated Name"
@@ -175,7 +164,13 @@ class TestCurrentUser:
         data = response.json()
         assert data["user_fullname"] == "Updated Name"
     
-    async def test_update_current_user_password(self, client: AsyncClient, test_user: dict, auth_headers: dict):
+    async def test_update_current_user_password(
+        self,
+        client: AsyncClient,
+        test_db: AsyncSession,
+        test_user: dict,
+        auth_headers: Mapping[str, bytes]
+    ):
         """Test updating current user password."""
         update_data = {
             "password": "NewSecurePass123!"
@@ -184,20 +179,17 @@ class TestCurrentUser:
         response = await client.patch("/auth/me", headers=auth_headers, json=update_data)
         assert response.status_code == 200
         
-        # Test login with new password
-        credentials = {
-            "user_number": test_user["user_number"],
-            "password": update_data["password"]
-        }
-        login_response = await client.post("/auth/login", json=credentials)
-        assert login_response.status_code == 200
+        # The stored hash now matches the new password (login is covered by TestUserLogin)
+        user = await test_db.get(UserModel, UUID(test_user["uuid5"]))
+        assert verify_password(update_data["password"], user.hashed_password)
+        assert not verify_password(test_user["password"], user.hashed_password)
 
 
 @pytest.mark.asyncio
 class TestAdminOperations:
     """Tests for admin-only endpoints."""
     
-    async def test_list_users_as_admin(self, client: AsyncClient, test_user: dict, test_admin: dict, admin_headers: dict):
+    async def test_list_users_as_admin(self, client: AsyncClient, test_user: dict, test_admin: dict, admin_headers: Mapping[str, bytes]):
         """Test admin can list all users."""
         response = await client.get("/auth/users", headers=admin_headers)
         assert response.status_code == 200
@@ -205,12 +197,12 @@ class TestAdminOperations:
         assert "items" in data
         assert len(data["items"]) >= 2  # At least test_user and test_admin
     
-    async def test_list_users_as_regular_user_fails(self, client: AsyncClient, auth_headers: dict):
+    async def test_list_users_as_regular_user_fails(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test regular user cannot list all users."""
         response = await client.get("/auth/users", headers=auth_headers)
         assert response.status_code == 403
     
-    async def test_list_users_with_filters(self, client: AsyncClient, test_user: dict, admin_headers: dict):
+    async def test_list_users_with_filters(self, client: AsyncClient, test_user: dict, admin_headers: Mapping[str, bytes]):
         """Test listing users with filters."""
         response = await client.get(
             f"/auth/users?is_active=true",
@@ -222,7 +214,7 @@ class TestAdminOperations:
         for user in data["items"]:
             assert user["is_active"] is True
     
-    async def test_delete_user_as_admin(self, client: AsyncClient, test_user: dict, admin_headers: dict):
+    async def test_delete_user_as_admin(self, client: AsyncClient, test_user: dict, admin_headers: Mapping[str, bytes]):
         """Test admin can delete a user."""
         response = await client.delete(
             f"/auth/users/{test_user['uuid5']}",
@@ -230,7 +222,7 @@ class TestAdminOperations:
         )
         assert response.status_code == 204
     
-    async def test_delete_user_as_regular_user_fails(self, client: AsyncClient, test_user: dict, auth_headers: dict):
+    async def test_delete_user_as_regular_user_fails(self, client: AsyncClient, test_user: dict, auth_headers: Mapping[str, bytes]):
         """Test regular user cannot delete users."""
         response = await client.delete(
             f"/auth/users/{test_user['uuid5']}",
@@ -238,7 +230,7 @@ class TestAdminOperations:
         )
         assert response.status_code == 403
     
-    async def test_admin_cannot_delete_themselves(self, client: AsyncClient, test_admin: dict, admin_headers: dict):
+    async def test_admin_cannot_delete_themselves(self, client: AsyncClient, test_admin: dict, admin_headers: Mapping[str, bytes]):
         """Test admin cannot delete their own account."""
         response = await client.delete(
             f"/auth/users/{test_admin['uuid5']}",
@@ -0,0 +1,76 @@
+"""
+Tests for the In-Process Result Cache
+
+Tests TTLCache expiry, size bound and clear semantics.
+"""
+
+import pytest
+
+from src.contrib import cache as cache_module
+from src.contrib.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Replace the cache's monotonic clock with a settable one."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "monotonic", lambda: now[0])
+    return now
+
+
+class TestTTLCache:
+    """Test TTLCache behavior."""
+
+    def test_get_missing_key_returns_none(self, clock: list[float]):
+        """Test get on an unknown key returns None."""
+        cache = TTLCache()
+        assert cache.get("missing") is None
+
+    def test_entry_expires_after_ttl(self, clock: list[float]):
+        """Test an entry is served until its ttl elapses, then dropped."""
+        cache = TTLCache(ttl=30)
+        cache.set("key", "value")
+
+        clock[0] += 29.9
+        assert cache.get("key") == "value"
+
+        clock[0] += 0.1
+        assert cache.get("key") is None
+
+        # Storing again after expiry starts a fresh ttl
+        cache.set("key", "renewed")
+        clock[0] += 29.9
+        assert cache.get("key") == "renewed"
+
+    def test_maxsize_evicts_oldest_entry(self, clock: list[float]):
+        """Test storing past maxsize evicts the least recently stored entry."""
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)  # re-storing moves "a" to the newest position
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 10
+        assert cache.get("c") == 3
+
+    def test_clear_drops_entries(self, clock: list[float]):
+        """Test clear removes every entry."""
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+
+    def test_set_skipped_after_concurrent_clear(self, clock: list[float]):
+        """Test a value loaded before a clear is not stored after it."""
+        cache = TTLCache()
+        generation = cache.generation
+        cache.clear()  # e.g. a write committed while the value was loading
+        cache.set("key", "stale", generation=generation)
+        assert cache.get("key") is None
+
+        cache.set("key", "fresh", generation=cache.generation)
+        assert cache.get("key") == "fresh"
@@ -4,15 +4,20 @@ Tests for Transaction Endpoints
 Tests transaction creation, deposits, withdrawals, transfers, and listing.
 """
 
+import asyncio
+import json
+from typing import Mapping
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
 
 @pytest.mark.asyncio
 class TestDeposits:
     """Tests for deposit transactions."""
     
-    async def test_create_deposit(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_create_deposit(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test creating a deposit transaction."""
         transaction_data = {
             "origin_account_number": test_account["account_number"],
@@ -28,7 +33,7 @@ class TestDeposits:
         assert "id" in data
         assert "created_at" in data
     
-    async def test_deposit_increases_balance(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_deposit_increases_balance(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test that deposit increases account balance."""
         initial_balance = test_account["balance"]
         deposit_amount = 1000.00
@@ -43,14 +48,9 @@ class TestDeposits:
         assert response.status_code == 201
         
         # Check account balance increased
-        accounts_response = await client.get("/accounts/me", headers=auth_headers)
-        accounts = accounts_response.json()["items"]
-        updated_account = next(
-            acc for acc in accounts if acc["account_number"] == test_account["account_number"]
-        )
-        assert updated_account["balance"] == initial_balance + deposit_amount
+        assert response.json()["origin_balance_after"] == initial_balance + deposit_amount
     
-    async def test_deposit_negative_value_fails(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_deposit_negative_value_fails(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test deposit with negative value fails."""
         transaction_data = {
             "origin_account_number": test_account["account_number"],
@@ -72,7 +72,7 @@ class TestDeposits:
         response = await client.post("/transactions/", json=transaction_data)
         assert response.status_code == 401
     
-    async def test_deposit_nonexistent_account_fails(self, client: AsyncClient, auth_headers: dict):
+    async def test_deposit_nonexistent_account_fails(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test deposit to non-existent account fails."""
         transaction_data = {
             "origin_account_number": 999999999,  # Valid int32 but non-existent
@@ -88,19 +88,10 @@ class TestDeposits:
 class TestWithdrawals:
     """Tests for withdrawal transactions."""
     
-    async def test_create_withdrawal(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_create_withdrawal(self, client: AsyncClient, funded_test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test creating a withdrawal transaction."""
-        # First deposit some money
-        deposit_data = {
-            "origin_account_number": test_account["account_number"],
-            "value": 1000.00,
-            "transaction_type": "deposit"
-        }
-        await client.post("/transactions/", headers=auth_headers, json=deposit_data)
-        
-        # Now withdraw
         withdrawal_data = {
-            "origin_account_number": test_account["account_number"],
+            "origin_account_number": funded_test_account["account_number"],
             "value": 200.00,
             "transaction_type": "withdrawal"
         }
@@ -111,29 +102,44 @@ class TestWithdrawals:
         assert data["value"] == 200.00
         assert data["transaction_type"] == "withdrawal"
     
-    async def test_withdrawal_decreases_balance(self, client: AsyncClient, test_account: dict, auth_headers: dict):
-        """Test that withdrawal decreases account balance."""
-        # Deposit money first
-        deposit_amount = 1000.00
-        deposit_data = {
-            "origin_account_number": test_account["account_number"],
-            "value": deposit_amount,
-            "transaction_type": "deposit"
+    async def test_withdrawal_reads_account_in_one_locked_statement(
+        self,
+        client: AsyncClient,
+        funded_test_account: dict,
+        auth_headers: Mapping[str, bytes],
+        test_engine
+    ):
+        """Test the limit checks read the account with one SELECT and no relationship loads."""
+        withdrawal_data = {
+            "origin_account_number": funded_test_account["account_number"],
+            "value": 200.00,
+            "transaction_type": "withdrawal"
         }
-        await client.post("/transactions/", headers=auth_headers, json=deposit_data)
+        selects = []
         
-        # Get current balance
-        accounts_response = await client.get("/accounts/me", headers=auth_headers)
-        accounts = accounts_response.json()["items"]
-        account = next(
-            acc for acc in accounts if acc["account_number"] == test_account["account_number"]
-        )
-        current_balance = account["balance"]
+        def record_select(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(statement)
+        
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record_select)
+        try:
+            response = await client.post("/transactions/", headers=auth_headers, json=withdrawal_data)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record_select)
+        
+        assert response.status_code == 201
+        # The authenticated user lookup, then the locked account with its withdrawal count
+        assert len(selects) == 2
+        assert "FOR UPDATE" in selects[1]
+    
+    async def test_withdrawal_decreases_balance(self, client: AsyncClient, funded_test_account: dict, auth_headers: Mapping[str, bytes]):
+        """Test that withdrawal decreases account balance."""
+        current_balance = funded_test_account["balance"]
         
         # Withdraw
         withdrawal_amount = 300.00
         withdrawal_data = {
-            "origin_account_number": test_account["account_number"],
+            "origin_account_number": funded_test_account["account_number"],
             "value": withdrawal_amount,
             "transaction_type": "withdrawal"
         }
@@ -141,14 +147,9 @@ class TestWithdrawals:
         assert response.status_code == 201
         
         # Check balance decreased
-        accounts_response = await client.get("/accounts/me", headers=auth_headers)
-        accounts = accounts_response.json()["items"]
-        updated_account = next(
-            acc for acc in accounts if acc["account_number"] == test_account["account_number"]
-        )
-        assert updated_account["balance"] == current_balance - withdrawal_amount
+        assert response.json()["origin_balance_after"] == current_balance - withdrawal_amount
     
-    async def test_withdrawal_insufficient_funds(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_withdrawal_insufficient_funds(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test withdrawal with insufficient funds fails."""
         # Try to withdraw more than balance (without special withdrawal limit)
         withdrawal_data = {
@@ -161,19 +162,11 @@ class TestWithdrawals:
         assert response.status_code == 400
         assert "insufficient" in response.json()["detail"].lower()
     
-    async def test_withdrawal_daily_limit(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_withdrawal_daily_limit(self, client: AsyncClient, funded_test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test withdrawal daily limit enforcement."""
-        # First deposit a large amount
-        deposit_data = {
-            "origin_account_number": test_account["account_number"],
-            "value": 10000.00,
-            "transaction_type": "deposit"
-        }
-        await client.post("/transactions/", headers=auth_headers, json=deposit_data)
-        
         # Make multiple withdrawals (default limit is 5)
         withdrawal_data = {
-            "origin_account_number": test_account["account_number"],
+            "origin_account_number": funded_test_account["account_number"],
             "value": 100.00,
             "transaction_type": "withdrawal"
         }
@@ -193,27 +186,11 @@ class TestWithdrawals:
 class TestTransfers:
     """Tests for transfer transactions."""
     
-    async def test_create_transfer(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_create_transfer(self, client: AsyncClient, funded_test_account: dict, dest_account: dict, auth_headers: Mapping[str, bytes]):
         """Test creating a transfer between accounts."""
-        # Create destination account
-        dest_account_data = {
-            "account_type": "checking",
-            "password": "DestPass123!"
-        }
-        dest_response = await client.post("/accounts/", headers=auth_headers, json=dest_account_data)
-        dest_account = dest_response.json()
-        
-        # Deposit money to source account
-        deposit_data = {
-            "origin_account_number": test_account["account_number"],
-            "value": 1000.00,
-            "transaction_type": "deposit"
-        }
-        await client.post("/transactions/", headers=auth_headers, json=deposit_data)
-        
         # Transfer money
         transfer_data = {
-            "origin_account_number": test_account["account_number"],
+            "origin_account_number": funded_test_account["account_number"],
             "destination_account_number": dest_account["account_number"],
             "value": 500.00,
             "transaction_type": "transfer"
@@ -225,49 +202,38 @@ class TestTransfers:
         assert data["value"] == 500.00
         assert data["transaction_type"] == "transfer"
     
-    async def test_transfer_without_destination_fails(self, client: AsyncClient, test_account: dict, auth_headers: dict):
-        """Test transfer without destination account fails."""
+    @pytest.mark.parametrize(
+        "destination,expected_status",
+        [
+            (None, 400),
+            (999999999, 404),  # Valid int32 but non-existent
+        ],
+        ids=["without_destination", "nonexistent_destination"]
+    )
+    async def test_transfer_invalid_destination_fails(
+        self,
+        client: AsyncClient,
+        funded_test_account: dict,
+        auth_headers: Mapping[str, bytes],
+        destination,
+        expected_status: int
+    ):
+        """Test transfer without a destination or to a non-existent account fails."""
         transfer_data = {
-            "origin_account_number": test_account["account_number"],
+            "origin_account_number": funded_test_account["account_number"],
             "value": 100.00,
             "transaction_type": "transfer"
         }
+        if destination is not None:
+            transfer_data["destination_account_number"] = destination
         
         response = await client.post("/transactions/", headers=auth_headers, json=transfer_data)
-        assert response.status_code == 400
-        assert "destination" in response.json()["detail"].lower()
+        assert response.status_code == expected_status
+        if destination is None:
+            assert "destination" in response.json()["detail"].lower()
     
-    async def test_transfer_to_nonexistent_account_fails(self, client: AsyncClient, test_account: dict, auth_headers: dict):
-        """Test transfer to non-existent account fails."""
-        # Deposit money first
-        deposit_data = {
-            "origin_account_number": test_account["account_number"],
-            "value": 1000.00,
-            "transaction_type": "deposit"
-        }
-        await client.post("/transactions/", headers=auth_headers, json=deposit_data)
-        
-        # Try to transfer
-        transfer_data = {
-            "origin_account_number": test_account["account_number"],
-            "destination_account_number": 999999999,  # Valid int32 but non-existent
-            "value": 100.00,
-            "transaction_type": "transfer"
-        }
-        
-        response = await client.post("/transactions/", headers=auth_headers, json=transfer_data)
-        assert response.status_code == 404
-    
-    async def test_transfer_insufficient_funds(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_transfer_insufficient_funds(self, client: AsyncClient, test_account: dict, dest_account: dict, auth_headers: Mapping[str, bytes]):
         """Test transfer with insufficient funds fails."""
-        # Create destination account
-        dest_account_data = {
-            "account_type": "checking",
-            "password": "DestPass123!"
-        }
-        dest_response = await client.post("/accounts/", headers=auth_headers, json=dest_account_data)
-        dest_account = dest_response.json()
-        
         # Try to transfer without sufficient balance
         transfer_data = {
             "origin_account_number": test_account["account_number"],
@@ -279,13 +245,46 @@ class TestTransfers:
         response = await client.post("/transactions/", headers=auth_headers, json=transfer_data)
         assert response.status_code == 400
         assert "insufficient" in response.json()["detail"].lower()
+    
+    async def test_opposite_concurrent_transfers_do_not_deadlock(
+        self,
+        concurrent_client: AsyncClient,
+        committed_account_pair: list[dict],
+        auth_headers: Mapping[str, bytes]
+    ):
+        """Test concurrent A->B and B->A transfers all succeed instead of deadlocking."""
+        first, second = (account["account_number"] for account in committed_account_pair)
+        transfers = [
+            {
+                "origin_account_number": origin,
+                "destination_account_number": destination,
+                "value": 10.00,
+                "transaction_type": "transfer"
+            }
+            for _ in range(5)
+            for origin, destination in ((first, second), (second, first))
+        ]
+        
+        responses = await asyncio.gather(*(
+            concurrent_client.post("/transactions/", headers=auth_headers, json=transfer_data)
+            for transfer_data in transfers
+        ))
+        assert [response.status_code for response in responses] == [201] * len(transfers)
+        
+        # Every transfer was matched by an opposite one of the same value
+        accounts_response = await concurrent_client.get("/accounts/me", headers=auth_headers)
+        balances = {
+            account["account_number"]: account["balance"]
+            for account in accounts_response.json()["items"]
+        }
+        assert balances[first] == balances[second] == committed_account_pair[0]["balance"]
 
 
 @pytest.mark.asyncio
 class TestTransactionListing:
     """Tests for transaction listing endpoints."""
     
-    async def test_list_my_transactions(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_list_my_transactions(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test listing logged-in user's transactions."""
         # Create a transaction
         transaction_data = {
@@ -301,8 +300,11 @@ class TestTransactionListing:
         data = response.json()
         assert "items" in data
         assert len(data["items"]) >= 1
+        assert set(data["items"][0]) == {
+            "id", "value", "transaction_type", "created_at", "origin_account_number"
+        }
     
-    async def test_list_transactions_filter_by_type(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_list_transactions_filter_by_type(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test filtering transactions by type."""
         # Create deposits and withdrawals
         deposit_data = {
@@ -326,10 +328,10 @@ class TestTransactionListing:
         )
         assert response.status_code == 200
         data = response.json()
-        for transaction in data["items"]:
-            assert transaction["transaction_type"] == "deposit"
+        assert data["items"]
+        assert all(t["transaction_type"] == "deposit" for t in data["items"])
     
-    async def test_list_transactions_filter_by_value(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_list_transactions_filter_by_value(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test filtering transactions by minimum value."""
         # Create transactions with different values
         for value in [100.00, 500.00, 1000.00]:
@@ -347,22 +349,61 @@ class TestTransactionListing:
         )
         assert response.status_code == 200
         data = response.json()
-        for transaction in data["items"]:
-            assert transaction["value"] >= 500.00
+        assert sorted(t["value"] for t in data["items"]) == [500.00, 1000.00]
     
-    async def test_list_all_transactions_as_admin(self, client: AsyncClient, admin_headers: dict):
+    async def test_list_all_transactions_as_admin(self, client: AsyncClient, admin_headers: Mapping[str, bytes]):
         """Test admin can list all transactions."""
         response = await client.get("/transactions/", headers=admin_headers)
         assert response.status_code == 200
         data = response.json()
         assert "items" in data
     
-    async def test_list_all_transactions_as_regular_user_fails(self, client: AsyncClient, auth_headers: dict):
+    async def test_list_all_transactions_as_admin_sees_new_transaction(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes], admin_headers: Mapping[str, bytes]):
+        """Test admin listing is not served stale after a new transaction."""
+        # Prime the listing cache
+        response = await client.get("/transactions/", headers=admin_headers)
+        assert response.status_code == 200
+        initial_total = response.json()["total"]
+        
+        transaction_data = {
+            "origin_account_number": test_account["account_number"],
+            "value": 150.00,
+            "transaction_type": "deposit"
+        }
+        await client.post("/transactions/", headers=auth_headers, json=transaction_data)
+        
+        response = await client.get("/transactions/", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json()["total"] == initial_total + 1
+    
+    async def test_list_all_transactions_as_regular_user_fails(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
         """Test regular user cannot list all transactions."""
         response = await client.get("/transactions/", headers=auth_headers)
         assert response.status_code == 403
     
-    async def test_get_transaction_by_id(self, client: AsyncClient, test_account: dict, auth_headers: dict):
+    async def test_export_transactions_as_admin(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes], admin_headers: Mapping[str, bytes]):
+        """Test admin can export transactions as NDJSON."""
+        for value in [100.00, 200.00]:
+            transaction_data = {
+                "origin_account_number": test_account["account_number"],
+                "value": value,
+                "transaction_type": "deposit"
+            }
+            await client.post("/transactions/", headers=auth_headers, json=transaction_data)
+        
+        response = await client.get("/transactions/export", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["value"] for line in lines] == [200.00, 100.00]
+        assert all("id" in line and "created_at" in line for line in lines)
+    
+    async def test_export_transactions_as_regular_user_fails(self, client: AsyncClient, auth_headers: Mapping[str, bytes]):
+        """Test regular user cannot export transactions."""
+        response = await client.get("/transactions/export", headers=auth_headers)
+        assert response.status_code == 403
+    
+    async def test_get_transaction_by_id(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes]):
         """Test getting a specific transaction by ID."""
         # Create a transaction
         transaction_data = {
@@ -385,26 +426,16 @@ class TestTransactionListing:
 class TestTransactionPermissions:
     """Tests for transaction permission checks."""
     
-    async def test_cannot_transact_on_other_users_account(self, client: AsyncClient, test_account: dict, test_admin: dict, auth_headers: dict):
+    async def test_cannot_transact_on_other_users_account(self, client: AsyncClient, test_account: dict, auth_headers: Mapping[str, bytes], admin_headers: Mapping[str, bytes]):
         """Test user cannot make transactions on accounts they don't own."""
         # Create an account for admin
-        admin_token_response = await client.post(
-            "/auth/login",
-            json={
-                "user_number": test_admin["user_number"],
-                "password": test_admin["password"]
-            }
-        )
-        admin_token = admin_token_response.json()["access_token"]
-        admin_auth_headers = {"Authorization": f"Bearer {admin_token}"}
-        
         admin_account_data = {
             "account_type": "savings",
             "password": "AdminAccountPass123!"
         }
         admin_account_response = await client.post(
             "/accounts/",
-            headers=admin_auth_headers,
+            headers=admin_headers,
             json=admin_account_data
         )
         admin_account = admin_account_response.json()